@@ -2,12 +2,11 @@
 The lume-epics controller serves as the intermediary between variable monitors
 and process variables served over EPICS.
 """
-from typing import Union, List
+from typing import Union, List, Dict, Any
 import numpy as np
 import copy
 import logging
 from datetime import datetime
-from collections import defaultdict
 from functools import partial
 from epics import PV
 import threading
@@ -27,6 +26,17 @@ DEFAULT_IMAGE_DATA = {
 
 DEFAULT_SCALAR_VALUE = 0
 
+# area detector pvs composing a Channel Access image
+CA_IMAGE_SUFFIXES = (
+    "ArrayData_RBV",
+    "ArraySizeX_RBV",
+    "ArraySizeY_RBV",
+    "MinX_RBV",
+    "MinY_RBV",
+    "MaxX_RBV",
+    "MaxY_RBV",
+)
+
 
 # TODO: Track update dates per pv
 # Check missing pvnames
@@ -44,9 +54,20 @@ class Controller:
         _protocols (dict): Dictionary mapping pvname to protocol ("pva" for pvAccess, "ca" for
             Channel Access)
 
+        _image_pvnames (Dict[str, tuple]): Mapping of Channel Access image pvname to
+            the monitored area detector pvnames composing the image
+
+        _image_data (Dict[str, dict]): Mapping of image pvname to the image data dict
+            reused by get_image
+
         _context (Context): P4P threaded context instance for use with pvAccess.
 
-        _pv_registry (dict): Registry mapping pvname to dict of value and pv monitor
+        _values (Dict[str, Any]): Mapping of pvname to latest monitored value
+
+        _pvs (Dict[str, Union[PV, Subscription]]): Mapping of pvname to Channel Access
+            PV or pvAccess monitor subscription
+
+        _pva_request (str): pvRequest used for pvAccess monitors
 
 
     Example:
@@ -63,7 +84,7 @@ class Controller:
 
     """
 
-    def __init__(self, epics_config: dict):
+    def __init__(self, epics_config: dict, pva_request: str = None):
         """
         Initializes controller. Stores protocol and creates context attribute if
         using pvAccess.
@@ -71,8 +92,16 @@ class Controller:
         Args:
             epics_config (dict): Dict describing epics configurations
 
+            pva_request (str): Optional pvRequest for pvAccess monitors, used to limit
+                the fields carried by each update or to let the server squash fast
+                updates, e.g. "record[queueSize=2]field(value,attribute)".
+
         """
-        self._pv_registry = defaultdict()
+        self._values: Dict[str, Any] = {}
+        self._pva_request = pva_request
+        self._pvs: Dict[str, Any] = {}
+        self._image_pvnames = {}
+        self._image_data = {}
         # latest update
         self.last_update = ""
 
@@ -116,7 +145,7 @@ class Controller:
 
             value (Union[np.ndarray, float]): Value to assign to process variable.
         """
-        self._pv_registry[pvname]["value"] = value
+        self._values[pvname] = value
 
         update_datetime = datetime.now().strftime("%m/%d/%Y, %H:%M:%S")
         self.last_update = update_datetime
@@ -125,7 +154,7 @@ class Controller:
     def _ca_connection_callback(self, *, pvname, conn, pv):
         """Callback used for monitoring connection and setting values to None on disconnect."""
         if not conn:
-            self._pv_registry[pvname]["value"] = None
+            self._values[pvname] = None
 
     def _pva_value_callback(self, pvname, value):
         """Callback executed by pvAccess monitor.
@@ -136,22 +165,27 @@ class Controller:
             value (Union[np.ndarray, float]): Value to assign to process variable.
         """
         if isinstance(value, Disconnected):
-            self._pv_registry[pvname]["value"] = None
-        else:
-            self._pv_registry[pvname]["value"] = value
+            value = None
+
+        self._values[pvname] = value
 
         update_datetime = datetime.now().strftime("%m/%d/%Y, %H:%M:%S")
         self.last_update = update_datetime
         self._last_updates[pvname] = update_datetime
 
-    def _set_up_pv_monitor(self, pvname, root=None):
+    def _set_up_pv_monitor(self, pvname, root=None, monitor: bool = True):
         """Set up process variable monitor.
 
         Args:
             pvname (str): Process variable name
 
+            root (str): Base process variable name used to look up the protocol
+
+            monitor (bool): Whether to subscribe to value updates. If False, values
+                are fetched on demand.
+
         """
-        if pvname in self._pv_registry:
+        if pvname in self._pvs:
             return
 
         if root:
@@ -163,40 +197,80 @@ class Controller:
         if protocol == "ca":
 
             # add to registry (must exist for connection callback)
-            self._pv_registry[pvname] = {"pv": None, "value": None}
+            self._values.setdefault(pvname, None)
 
             # create the pv
-            pv_obj = PV(
-                pvname,
-                callback=self._ca_value_callback,
-                connection_callback=self._ca_connection_callback,
-            )
-
-            # update registry
-            self._pv_registry[pvname]["pv"] = pv_obj
+            if monitor:
+                self._pvs[pvname] = PV(
+                    pvname,
+                    callback=self._ca_value_callback,
+                    connection_callback=self._ca_connection_callback,
+                )
+
+            # no subscription, values collected using pv.get()
+            else:
+                self._pvs[pvname] = PV(
+                    pvname,
+                    auto_monitor=False,
+                    connection_callback=self._ca_connection_callback,
+                )
+
+        elif protocol == "pva" and not monitor:
+            # no subscription, values collected using context.get()
+            self._values.setdefault(pvname, None)
+            self._pvs[pvname] = None
 
         elif protocol == "pva":
             cb = partial(self._pva_value_callback, pvname)
             # populate registry s.t. initially disconnected will populate
-            self._pv_registry[pvname] = {"pv": None, "value": None}
+            self._values.setdefault(pvname, None)
 
-            # create the monitor obj
-            mon_obj = self._context.monitor(pvname, cb, notify_disconnect=True)
+            # create the monitor obj, disconnect notifications reset the value
+            self._pvs[pvname] = self._context.monitor(
+                pvname, cb, request=self._pva_request, notify_disconnect=True
+            )
 
-            # update registry with the monitor
-            self._pv_registry[pvname]["pv"] = mon_obj
+    def _set_up_image_monitors(self, pvname: str, monitor: bool = True) -> tuple:
+        """Set up monitors for all area detector process variables composing a
+        Channel Access image.
+
+        Args:
+            pvname (str): Base process variable name of the image
+
+            monitor (bool): Whether to subscribe to value updates
+
+        Returns:
+            tuple: Monitored process variable names in order of CA_IMAGE_SUFFIXES
 
-    def get(self, pvname: str, root: str = None) -> np.ndarray:
+        """
+        image_pvnames = self._image_pvnames.get(pvname)
+
+        if image_pvnames is None:
+            image_pvnames = tuple(f"{pvname}:{suffix}" for suffix in CA_IMAGE_SUFFIXES)
+            for image_pvname in image_pvnames:
+                self._set_up_pv_monitor(image_pvname, root=pvname, monitor=monitor)
+
+            self._image_pvnames[pvname] = image_pvnames
+
+        return image_pvnames
+
+    def get(self, pvname: str, root: str = None, monitor: bool = True) -> np.ndarray:
         """
         Accesses and returns the value of a process variable.
 
         Args:
             varname (str): Model variable name
 
+            root (str): Base process variable name used to look up the protocol
+
+            monitor (bool): Whether to subscribe to value updates on first access.
+                Unmonitored values are fetched on each call.
+
         """
-        self._set_up_pv_monitor(pvname, root=root)
+        self._set_up_pv_monitor(pvname, root=root, monitor=monitor)
 
-        pv = self._pv_registry.get(pvname, None)
+        if pvname not in self._pvs:
+            return None
 
         if root:
             protocol = self._protocols[root]
@@ -204,59 +278,71 @@ class Controller:
         else:
             protocol = self._protocols[pvname]
 
-        if pv:
-            val = pv["value"]
-            if val is None:
-                if protocol == "ca":
-                    val = pv["pv"].get()
+        val = self._values.get(pvname)
+        if val is None:
+            if protocol == "ca":
+                val = self._pvs[pvname].get()
 
-                elif protocol == "pva":
-                    val = self._context.get(pvname)
+            elif protocol == "pva":
+                val = self._context.get(pvname)
 
-            return val
+        return val
 
-        return None
-
-    def get_value(self, varname):
+    def get_value(self, varname, monitor: bool = True):
         """Gets scalar value of a process variable.
 
         Args:
             varname (str): Model variable name
 
+            monitor (bool): Whether to subscribe to value updates on first access
+
         """
         pvname = self._get_pvname(varname)
-        value = self.get(pvname)
+        value = self.get(pvname, monitor=monitor)
 
         if value is None:
             value = DEFAULT_SCALAR_VALUE
 
         return value
 
-    def get_image(self, varname) -> dict:
+    def get_image(self, varname, writable: bool = False, monitor: bool = True) -> dict:
         """Gets image data via controller protocol.
 
         Args:
             varname (str): Model variable name
 
+            writable (bool): Whether to return a writable copy of pvAccess image
+                data. By default, a read-only view of the monitored array is returned.
+
+            monitor (bool): Whether to subscribe to image updates on first access.
+                Unmonitored images are fetched on each call, which avoids streaming
+                large images that are only read occasionally.
+
+        Returns:
+            dict: Image data formatted for bokeh image glyphs. The same dict and lists
+                are reused and updated in place across calls for a variable, so callers
+                should build their own before modifying or storing the data.
+
         """
         pvname = self._get_pvname(varname)
         image = None
 
         if self._protocols[pvname] == "ca":
-            image_flat = self.get(f"{pvname}:ArrayData_RBV", root=pvname)
-            nx = self.get(f"{pvname}:ArraySizeX_RBV", root=pvname)
-            ny = self.get(f"{pvname}:ArraySizeY_RBV", root=pvname)
-            x = self.get(f"{pvname}:MinX_RBV", root=pvname)
-            y = self.get(f"{pvname}:MinY_RBV", root=pvname)
-            x_max = self.get(f"{pvname}:MaxX_RBV", root=pvname)
-            y_max = self.get(f"{pvname}:MaxY_RBV", root=pvname)
-
-            if all(
-                [
-                    image_def is not None
-                    for image_def in [image_flat, nx, ny, x, y, x_max, y_max]
+            image_pvnames = self._set_up_image_monitors(pvname, monitor=monitor)
+
+            # read monitored values, only fetching those not yet collected
+            image_defs = [self._values[image_pvname] for image_pvname in image_pvnames]
+            if any([image_def is None for image_def in image_defs]):
+                image_defs = [
+                    self.get(image_pvname, root=pvname)
+                    if image_def is None
+                    else image_def
+                    for image_pvname, image_def in zip(image_pvnames, image_defs)
                 ]
-            ):
+
+            image_flat, nx, ny, x, y, x_max, y_max = image_defs
+
+            if all([image_def is not None for image_def in image_defs]):
                 dw = x_max - x
                 dh = y_max - y
 
@@ -264,42 +350,63 @@ class Controller:
 
         elif self._protocols[pvname] == "pva":
             # context returns numpy array with WRITEABLE=False
-            # copy to manipulate array below
+            # only copy if the caller needs to manipulate the array
 
-            image = self.get(pvname)
+            image = self.get(pvname, monitor=monitor)
 
             if image is not None:
                 attrib = image.attrib
                 x = attrib["x_min"]
                 y = attrib["y_min"]
-                dw = attrib["x_max"] - attrib["x_min"]
-                dh = attrib["y_max"] - attrib["y_min"]
-                image = copy.copy(image)
+                dw = attrib["x_max"] - x
+                dh = attrib["y_max"] - y
+
+                if writable:
+                    image = copy.copy(image)
+
+                else:
+                    image = np.asarray(image)
 
         if image is not None:
-            return {
-                "image": [image],
-                "x": [x],
-                "y": [y],
-                "dw": [dw],
-                "dh": [dh],
-            }
+            image_data = self._image_data.get(pvname)
+
+            if image_data is None:
+                image_data = {
+                    "image": [None],
+                    "x": [None],
+                    "y": [None],
+                    "dw": [None],
+                    "dh": [None],
+                }
+                self._image_data[pvname] = image_data
+
+            image_data["image"][0] = image
+            image_data["x"][0] = x
+            image_data["y"][0] = y
+            image_data["dw"][0] = dw
+            image_data["dh"][0] = dh
+
+            return image_data
 
         else:
             return DEFAULT_IMAGE_DATA
 
-    def get_array(self, varname) -> dict:
+    def get_array(self, varname, monitor: bool = True) -> dict:
         """Gets array data via controller protocol.
 
         Args:
             varname (str): Model variable name
 
+            monitor (bool): Whether to subscribe to array updates on first access
+
         """
         pvname = self._get_pvname(varname)
         array = None
         if self._protocols[pvname] == "ca":
-            array_flat = self.get(f"{pvname}:ArrayData_RBV", root=pvname)
-            shape = self.get(f"{pvname}:ArraySize_RBV", root=pvname)
+            array_flat = self.get(
+                f"{pvname}:ArrayData_RBV", root=pvname, monitor=monitor
+            )
+            shape = self.get(f"{pvname}:ArraySize_RBV", root=pvname, monitor=monitor)
 
             if all([array_def is not None for array_def in [array_flat, shape]]):
 
@@ -309,7 +416,7 @@ class Controller:
             # context returns numpy array with WRITEABLE=False
             # copy to manipulate array below
 
-            array = self.get(pvname)
+            array = self.get(pvname, monitor=monitor)
 
         if array is not None:
             return array
@@ -336,7 +443,7 @@ class Controller:
         # if the value is registered
         if registered is not None:
             if self._protocols[pvname] == "ca":
-                self._pv_registry[pvname]["pv"].put(value, timeout=timeout)
+                self._pvs[pvname].put(value, timeout=timeout)
 
             elif self._protocols[pvname] == "pva":
                 self._context.put(pvname, value, throw=False, timeout=timeout)
@@ -383,35 +490,26 @@ class Controller:
             if self._protocols[pvname] == "ca":
 
                 if image_array is not None:
-                    self._pv_registry[f"{pvname}:ArrayData_RBV"]["pv"].put(
+                    self._pvs[f"{pvname}:ArrayData_RBV"].put(
                         image_array.flatten(), timeout=timeout
                     )
 
                 if x_min:
-                    self._pv_registry[f"{pvname}:MinX_RBV"]["pv"].put(
-                        x_min, timeout=timeout
-                    )
+                    self._pvs[f"{pvname}:MinX_RBV"].put(x_min, timeout=timeout)
 
                 if x_max:
-                    self._pv_registry[f"{pvname}:MaxX_RBV"]["pv"].put(
-                        x_max, timeout=timeout
-                    )
+                    self._pvs[f"{pvname}:MaxX_RBV"].put(x_max, timeout=timeout)
 
                 if y_min:
-                    self._pv_registry[f"{pvname}:MinY_RBV"]["pv"].put(
-                        y_min, timeout=timeout
-                    )
+                    self._pvs[f"{pvname}:MinY_RBV"].put(y_min, timeout=timeout)
 
                 if y_max:
-                    self._pv_registry[f"{pvname}:MaxY_RBV"]["pv"].put(
-                        y_max, timeout=timeout
-                    )
+                    self._pvs[f"{pvname}:MaxY_RBV"].put(y_max, timeout=timeout)
 
             elif self._protocols[pvname] == "pva":
 
                 # compose normative type
-                pv = self._pv_registry[pvname]
-                pv_array = pv["value"]
+                pv_array = self._values[pvname]
 
                 if image_array:
                     image_array.attrib = pv_array.attrib
@@ -463,21 +561,95 @@ class Controller:
             if self._protocols[pvname] == "ca":
 
                 if array is not None:
-                    self._pv_registry[f"{pvname}:ArrayData_RBV"]["pv"].put(
+                    self._pvs[f"{pvname}:ArrayData_RBV"].put(
                         array.flatten(), timeout=timeout
                     )
 
             elif self._protocols[pvname] == "pva":
 
                 # compose normative type
-                pv = self._pv_registry[pvname]
-                array = pv["value"]
+                array = self._values[pvname]
 
                 self._context.put(pvname, array, throw=False, timeout=timeout)
 
         else:
             logger.debug(f"No initial value set for {pvname}.")
 
+    def disable_monitor(self, varname) -> None:
+        """Stop monitoring a process variable. The process variable remains
+        registered, and subsequent reads fetch values on demand until the monitor is
+        re-enabled.
+
+        Args:
+            varname (str): Model variable name
+
+        """
+        pvname = self._get_pvname(varname)
+
+        for monitored_pvname in self._get_monitored_pvnames(pvname):
+            pv = self._pvs[monitored_pvname]
+
+            if self._protocols[pvname] == "ca":
+                pv.clear_callbacks()
+                pv.clear_auto_monitor()
+
+            elif pv is not None:
+                pv.close()
+                self._pvs[monitored_pvname] = None
+
+            self._values[monitored_pvname] = None
+
+    def enable_monitor(self, varname) -> None:
+        """Resume monitoring a process variable previously disabled with
+        disable_monitor.
+
+        Args:
+            varname (str): Model variable name
+
+        """
+        pvname = self._get_pvname(varname)
+
+        for monitored_pvname in self._get_monitored_pvnames(pvname):
+
+            # resubscribe on the kept channel access pv, avoiding a reconnect
+            if self._protocols[pvname] == "ca":
+                pv = self._pvs[monitored_pvname]
+                pv.auto_monitor = True
+
+                if not pv.callbacks:
+                    pv.add_callback(self._ca_value_callback)
+
+            # pvAccess subscriptions are closed on disable, so recreate
+            else:
+                pv = self._pvs.pop(monitored_pvname)
+
+                if pv is not None:
+                    pv.close()
+
+                self._set_up_pv_monitor(monitored_pvname, root=pvname)
+
+    def _get_monitored_pvnames(self, pvname) -> List[str]:
+        """Get registered process variables owned by a configured pvname, including
+        Channel Access area detector process variables.
+
+        Args:
+            pvname (str): Process variable name
+
+        """
+        owned = [
+            pvname,
+            *self._image_pvnames.get(pvname, ()),
+            f"{pvname}:ArrayData_RBV",
+            f"{pvname}:ArraySize_RBV",
+        ]
+
+        # image and array pvs share ArrayData_RBV
+        return [
+            owned_pvname
+            for owned_pvname in dict.fromkeys(owned)
+            if owned_pvname in self._pvs
+        ]
+
     def close(self):
         if self._context is not None:
             self._context.close()
@@ -183,9 +183,12 @@ class ImagePlot:
 
         # get image data
         image_data = self.pv_monitors[self.live_variable].poll()
-        image_data["image"][0] = np.flipud(image_data["image"][0].T)
 
-        self.source.data.update(image_data)
+        # controller image data is reused across calls, build own columns
+        data = {key: [value[0]] for key, value in image_data.items()}
+        data["image"][0] = np.flipud(data["image"][0].T)
+
+        self.source.data.update(data)
 
 
 class Striptool:
@@ -1,8 +1,7 @@
-import copy
 import logging
 import multiprocessing
-import time
 import signal
+import threading
 from typing import Dict
 from lume_model.variables import Variable, InputVariable, OutputVariable
 import numpy as np
@@ -86,6 +85,10 @@ class CAServer(CAProcess):
 
         _out_queue (multiprocessing.Queue): Process model output variables and sync with pvAccess server
 
+        _cached_values (dict): Input updates cached until they can be submitted
+
+        _cached_values_lock (threading.Lock): Lock guarding cached values in server process
+
     """
 
     protocol = "ca"
@@ -134,8 +137,9 @@ class CAServer(CAProcess):
             var_name: config["pvname"] for var_name, config in epics_config.items()
         }
 
-        # cached pv values
+        # cached pv values, lock is created in the server process
         self._cached_values = {}
+        self._cached_values_lock = None
         self._monitors = {}
 
     def update_pv(self, pvname, value) -> None:
@@ -153,41 +157,45 @@ class CAServer(CAProcess):
 
         variable = self._input_variables[model_var_name]
 
-        # check for already cached variable
-        variable = self._cached_values.get(model_var_name, variable)
+        # check for already cached variable, submitted by run loop
+        with self._cached_values_lock:
+            cached_variable = self._cached_values.get(model_var_name)
 
-        # check for image variable and proper assignments
-        if variable.variable_type == "image":
+            # cache a copy, submitted variables are pickled later without the lock
+            if cached_variable is None:
+                cached_variable = variable.copy()
 
-            attr_type = pvname.split(":")[-1]
+            variable = cached_variable
 
-            if attr_type == "ArrayData_RBV":
-                value = np.array(value)
-                value = value.reshape(variable.shape)
-                variable.value = value
+            # check for image variable and proper assignments
+            if variable.variable_type == "image":
 
-            if attr_type == "MinX_RBV":
-                variable.x_min = value
+                attr_type = pvname.split(":")[-1]
 
-            if attr_type == "MinY_RBV":
-                variable.y_min = value
+                if attr_type == "ArrayData_RBV":
+                    value = np.array(value)
+                    value = value.reshape(variable.shape)
+                    variable.value = value
 
-            if attr_type == "MaxX_RBV":
-                variable.x_max = value
+                if attr_type == "MinX_RBV":
+                    variable.x_min = value
 
-            if attr_type == "MaxY_RBV":
-                variable.y_max = value
+                if attr_type == "MinY_RBV":
+                    variable.y_min = value
 
-        # assign value
-        else:
-            variable.value = value
+                if attr_type == "MaxX_RBV":
+                    variable.x_max = value
 
-        self._cached_values[model_var_name] = variable
+                if attr_type == "MaxY_RBV":
+                    variable.y_max = value
 
-        # only update if not running
-        if not self._running_indicator.value:
-            self._in_queue.put({"protocol": "ca", "vars": self._cached_values})
-            self._cached_values = {}
+            # assign value
+            else:
+                variable.value = value
+
+            self._cached_values[model_var_name] = variable
+
+        self._submit_cached_values()
 
     def _monitor_callback(self, pvname=None, value=None, **kwargs) -> None:
         """Callback executed on value change events."""
@@ -197,41 +205,73 @@ class CAServer(CAProcess):
         if not variable:
             variable = self._output_variables.get(model_var_name)
 
-        # check for already cached variable
-        variable = self._cached_values.get(model_var_name, variable)
+        # check for already cached variable, submitted by run loop
+        with self._cached_values_lock:
+            cached_variable = self._cached_values.get(model_var_name)
 
-        # check for image variable and proper assignments
-        if variable.variable_type == "image":
+            # cache a copy, submitted variables are pickled later without the lock
+            if cached_variable is None:
+                cached_variable = variable.copy()
 
-            attr_type = pvname.split(":")[-1]
+            variable = cached_variable
 
-            if attr_type == "ArrayData_RBV":
-                value = value.reshape(variable.shape())
-                variable.value = value
+            # check for image variable and proper assignments
+            if variable.variable_type == "image":
 
-            if attr_type == "MinX_RBV":
-                variable.x_min = value
+                attr_type = pvname.split(":")[-1]
 
-            if attr_type == "MinY_RBV":
-                variable.y_mix = value
+                if attr_type == "ArrayData_RBV":
+                    value = value.reshape(variable.shape())
+                    variable.value = value
 
-            if attr_type == "MaxX_RBV":
-                variable.x_max = value
+                if attr_type == "MinX_RBV":
+                    variable.x_min = value
 
-            if attr_type == "MaxY_RBV":
-                variable.y_max = value
+                if attr_type == "MinY_RBV":
+                    variable.y_mix = value
 
-        # assign value
-        else:
-            variable.value = value
+                if attr_type == "MaxX_RBV":
+                    variable.x_max = value
 
-        self._cached_values[model_var_name] = variable
+                if attr_type == "MaxY_RBV":
+                    variable.y_max = value
 
+            # assign value
+            else:
+                variable.value = value
+
+            self._cached_values[model_var_name] = variable
+
+        self._submit_cached_values()
+
+    def _submit_cached_values(self) -> None:
+        """Submit all cached input updates to the input queue in a single message.
+        Nothing is submitted while the model is executing or if no updates are cached.
+        If the input queue is full, the updates are returned to the cache and retried
+        by the run loop rather than blocking the server thread.
+        """
         # only update if not running
-        if not self._running_indicator.value:
-            self._in_queue.put({"protocol": "ca", "vars": self._cached_values})
+        if self._running_indicator.value:
+            return
+
+        with self._cached_values_lock:
+            if not self._cached_values:
+                return
+
+            cached_values = self._cached_values
             self._cached_values = {}
 
+        try:
+            self._in_queue.put_nowait({"protocol": "ca", "vars": cached_values})
+
+        except Full:
+            logger.debug("in queue full, holding %s cached values", len(cached_values))
+
+            # updates cached in the meantime take precedence
+            with self._cached_values_lock:
+                cached_values.update(self._cached_values)
+                self._cached_values = cached_values
+
     def _initialize_model(self):
         """Initialize model"""
         self._in_queue.put({"protocol": "ca", "vars": self._input_variables})
@@ -284,7 +324,7 @@ class CAServer(CAProcess):
         # differentiate between values to serve and not to serve
         to_serve = []
         external = []
-        variables = copy.deepcopy(self._input_variables)
+        variables = dict(self._input_variables)
         variables.update(self._output_variables)
 
         for var in variables:
@@ -343,19 +383,24 @@ class CAServer(CAProcess):
 
     def run(self) -> None:
         """Start server process."""
+        # guards cached values shared by driver, monitor, and run loop threads
+        self._cached_values_lock = threading.Lock()
+
         started = self.setup_server()
         if started:
             while not self.shutdown_event.is_set():
                 try:
-                    data = self._out_queue.get_nowait()
+                    data = self._out_queue.get(timeout=0.1)
                     inputs = data.get("input_variables", {})
                     outputs = data.get("output_variables", {})
                     self.update_pvs(inputs, outputs)
 
                 except Empty:
-                    time.sleep(0.05)
                     logger.debug("out queue empty")
 
+                # retry updates held while running or while the in queue was full
+                self._submit_cached_values()
+
             # if server thread running
             if self._server_thread is not None:
                 self._server_thread.stop()
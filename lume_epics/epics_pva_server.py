@@ -1,14 +1,13 @@
 import logging
-import copy
 import multiprocessing
+import threading
 from multiprocessing.managers import DictProxy
 from queue import Full, Empty
 from lume_epics import model
 import numpy as np
-import time
 import signal
-from typing import List, Union
-from functools import partial
+from typing import List, Union, Tuple
+from functools import partial, lru_cache
 from typing import Dict
 from lume_model.variables import InputVariable, OutputVariable
 from p4p.client.thread import Context
@@ -26,6 +25,34 @@ p4p_logger.setLevel("DEBUG")
 
 logger = logging.getLogger(__name__)
 
+# structure of model summary pv
+SUMMARY_SPEC = [
+    ("id", "s"),
+    ("owner", "s"),
+    ("date_published", "s"),
+    ("description", "s"),
+    ("input_variables", "as"),
+    ("output_variables", "as"),
+]
+
+# normative types shared between pvs
+_NT_DOUBLE = NTScalar("d")
+_NT_STRING_ARRAY = NTScalar("as")
+_NT_NDARRAY = NTNDArray()
+
+
+@lru_cache(maxsize=None)
+def _nt_table(columns: Tuple[str]) -> NTTable:
+    """Get the normative table type for a set of columns. Types are cached by
+    column names.
+
+    Args:
+        columns (Tuple[str]): Table column names
+
+    """
+    # here we assume double type in tables...
+    return NTTable([(col, "d") for col in columns])
+
 
 class PVAServer(multiprocessing.Process):
     """
@@ -45,6 +72,13 @@ class PVAServer(multiprocessing.Process):
         _cached_values (dict): Dict for caching values while model executes
         _pvname_to_varname_map (dict): Mapping of pvname to variable name
         _varname_to_pvname_map (dict): Mapping of variable name to pvame
+        _image_attribs (dict): Mapping of image variable name to cached NTNDArray attributes
+        _image_bounds (dict): Mapping of image variable name to bounds used for cached attributes
+        _value_fns (dict): Mapping of variable name to function building its posted value
+        _max_batch_size (int): Maximum number of out queue updates merged per pv update
+        _coalesce_interval (float): Interval in seconds between submissions of cached values
+        _cached_values_lock (threading.Lock): Lock guarding cached values in server process
+        _coalesce_thread (threading.Thread): Thread submitting cached values to the input queue
 
     """
 
@@ -59,6 +93,8 @@ class PVAServer(multiprocessing.Process):
         out_queue: multiprocessing.Queue,
         running_indicator: multiprocessing.Value,
         *args,
+        max_batch_size: int = 64,
+        coalesce_interval: float = 0.02,
         **kwargs,
     ) -> None:
         """Initialize server process.
@@ -70,12 +106,19 @@ class PVAServer(multiprocessing.Process):
 
             epics_config (dict): Dictionary describing EPICS configuration for model variables
 
-            in_queue (multiprocessing.Queue): Queue for tracking updates to input variables
+            in_queue (multiprocessing.Queue): Queue for tracking updates to input
+                variables. Should be bounded, updates are held back while full.
 
             out_queue (multiprocessing.Queue): Queue for tracking updates to output variables
 
             running_indicator (multiprocessing.Value): Boolean indicator indicating running model execution
 
+            max_batch_size (int): Maximum number of queued output updates to merge
+                into a single process variable update
+
+            coalesce_interval (float): Interval in seconds at which cached input
+                updates are submitted to the input queue
+
         """
 
         super().__init__(*args, **kwargs)
@@ -93,6 +136,14 @@ class PVAServer(multiprocessing.Process):
         self._monitors = {}
         self._cached_values = {}
         self._field_to_parent_map = {}
+        self._image_attribs = {}
+        self._image_bounds = {}
+        self._value_fns = {}
+        self._max_batch_size = max_batch_size
+        self._coalesce_interval = coalesce_interval
+        # created in server process, locks cannot be pickled
+        self._cached_values_lock = None
+        self._coalesce_thread = None
 
         # utility maps
         self._pvname_to_varname_map = {
@@ -111,53 +162,122 @@ class PVAServer(multiprocessing.Process):
             value (Union[np.ndarray, float]): Value to set
 
         """
-        # Hack for now to get the pickable value
-        value = value.raw.value
-
         varname = self._pvname_to_varname_map[pvname]
-        model_variable = self._input_variables[varname]
 
+        # check for already cached variable, submitted by coalescing thread
+        with self._cached_values_lock:
+            model_variable = self._cached_values.get(varname)
+
+            # cache a copy, submitted variables are pickled later without the lock
+            if model_variable is None:
+                model_variable = self._input_variables[varname].copy()
+
+            self._assign_value(model_variable, value)
+            self._cached_values[varname] = model_variable
+
+    def _assign_value(
+        self, model_variable: Union[InputVariable, OutputVariable], value
+    ) -> None:
+        """Assign an unwrapped p4p value to a model variable, converting to a
+        picklable value.
+
+        Args:
+            model_variable (Union[InputVariable, OutputVariable]): Variable to update
+
+            value: Unwrapped p4p value
+
+        """
         if model_variable.variable_type == "image":
             model_variable.x_min = value.attrib["x_min"]
             model_variable.x_max = value.attrib["x_max"]
             model_variable.y_min = value.attrib["y_min"]
             model_variable.y_max = value.attrib["y_max"]
+            model_variable.value = np.asarray(value)
 
-        # check for already cached variable
-        model_variable = self._cached_values.get(varname, model_variable)
+        elif (
+            model_variable.variable_type == "array"
+            and model_variable.value_type != "str"
+        ):
+            model_variable.value = np.asarray(value)
 
-        self._cached_values[varname] = model_variable
+        else:
+            # Hack for now to get the pickable value
+            model_variable.value = value.raw.value
 
-        # only update if not running
-        if not self._running_indicator.value:
-            self._in_queue.put({"protocol": self.protocol, "vars": self._cached_values})
-            self._cached_values = {}
+    def _get_image_attrib(self, variable: Union[InputVariable, OutputVariable]) -> dict:
+        """Get the NTNDArray attributes for an image variable. The cached attribute
+        dict is only updated when the image bounds change.
+
+        Args:
+            variable (Union[InputVariable, OutputVariable]): Image variable
+
+        """
+        bounds = (variable.x_min, variable.y_min, variable.x_max, variable.y_max)
+
+        if self._image_bounds.get(variable.name) != bounds:
+            attrib = self._image_attribs.setdefault(variable.name, {})
+            attrib["x_min"] = variable.x_min
+            attrib["y_min"] = variable.y_min
+            attrib["x_max"] = variable.x_max
+            attrib["y_max"] = variable.y_max
+            self._image_bounds[variable.name] = bounds
+
+        return self._image_attribs[variable.name]
 
     def _monitor_callback(self, pvname, V) -> None:
         """Callback function used for updating read_only process variables."""
-        value = V.raw.value
         varname = self._pvname_to_varname_map[pvname]
         model_variable = self._input_variables[varname]
 
         if not model_variable:
             model_variable = self._output_variables[varname]
 
-        # check for already cached variable
-        model_variable = self._cached_values.get(varname, model_variable)
+        # check for already cached variable, submitted by coalescing thread
+        with self._cached_values_lock:
+            cached_variable = self._cached_values.get(varname)
 
-        if model_variable.variable_type == "image":
-            model_variable.x_min = value.attrib["x_min"]
-            model_variable.x_max = value.attrib["x_max"]
-            model_variable.y_min = value.attrib["y_min"]
-            model_variable.y_max = value.attrib["y_max"]
+            # cache a copy, submitted variables are pickled later without the lock
+            if cached_variable is None:
+                cached_variable = model_variable.copy()
 
-        self._cached_values[varname] = model_variable
+            self._assign_value(cached_variable, V)
+            self._cached_values[varname] = cached_variable
 
+    def _submit_cached_values(self) -> None:
+        """Submit all cached input updates to the input queue in a single message.
+        Nothing is submitted while the model is executing or if no updates are cached.
+        If the input queue is full, the updates are returned to the cache for the next
+        submission rather than blocking.
+        """
         # only update if not running
-        if not self._running_indicator.value:
-            self._in_queue.put({"protocol": self.protocol, "vars": self._cached_values})
+        if self._running_indicator.value:
+            return
+
+        with self._cached_values_lock:
+            if not self._cached_values:
+                return
+
+            cached_values = self._cached_values
             self._cached_values = {}
 
+        try:
+            self._in_queue.put_nowait(
+                {"protocol": self.protocol, "vars": cached_values}
+            )
+
+        except Full:
+            logger.debug("in queue full, holding %s cached values", len(cached_values))
+
+            # updates cached in the meantime take precedence
+            with self._cached_values_lock:
+                cached_values.update(self._cached_values)
+                self._cached_values = cached_values
+
+    def _coalesce_cached_values(self) -> None:
+        """Periodically submit cached input updates until shutdown."""
+        while not self.shutdown_event.wait(self._coalesce_interval):
+            self._submit_cached_values()
+
     def _initialize_model(self):
         """Initialize model"""
 
@@ -165,6 +285,62 @@ class PVAServer(multiprocessing.Process):
 
         self._in_queue.put(rep)
 
+    def _build_scalar_nt(self, variable: Union[InputVariable, OutputVariable]) -> tuple:
+        """Scalars are served as NTScalar doubles."""
+        return _NT_DOUBLE, variable.value
+
+    def _build_image_nt(self, variable: Union[InputVariable, OutputVariable]) -> tuple:
+        """Images are served as NTNDArrays with image bounds as attributes."""
+        nd_array = variable.value.view(NTNDArrayData)
+        nd_array.attrib = self._get_image_attrib(variable)
+        return _NT_NDARRAY, nd_array
+
+    def _build_table_nt(self, variable: Union[InputVariable, OutputVariable]) -> tuple:
+        """Tables are served as NTTables of double columns."""
+        nt = _nt_table(tuple(variable.columns))
+        return nt, nt.wrap(variable.value)
+
+    def _build_array_nt(self, variable: Union[InputVariable, OutputVariable]) -> tuple:
+        """Numeric arrays are served as NTNDArrays."""
+        return _NT_NDARRAY, variable.value.view(NTNDArrayData)
+
+    def _build_string_array_nt(
+        self, variable: Union[InputVariable, OutputVariable]
+    ) -> tuple:
+        """String arrays are served as NTScalar string arrays."""
+        return _NT_STRING_ARRAY, variable.value
+
+    # normative type builders by variable type
+    _nt_builders = {
+        "scalar": _build_scalar_nt,
+        "image": _build_image_nt,
+        "table": _build_table_nt,
+        "array": _build_array_nt,
+        "string_array": _build_string_array_nt,
+    }
+
+    def _build_nt(self, variable: Union[InputVariable, OutputVariable]) -> tuple:
+        """Build the normative type and initial value used to serve a variable.
+
+        Args:
+            variable (Union[InputVariable, OutputVariable]): Variable to serve
+
+        Returns:
+            tuple: normative type and initial value
+
+        """
+        variable_type = variable.variable_type
+        if variable_type == "array" and variable.value_type == "str":
+            variable_type = "string_array"
+
+        builder = self._nt_builders.get(variable_type)
+        if builder is None:
+            raise ValueError(
+                f"Unsupported variable type provided: {variable.variable_type}"
+            )
+
+        return builder(self, variable)
+
     def setup_server(self) -> None:
         """Configure and start server."""
 
@@ -212,7 +388,7 @@ class PVAServer(multiprocessing.Process):
             model_output_vars = model_outputs.get("output_variables", {})
             self._output_variables.update(model_output_vars)
 
-            variables = copy.deepcopy(self._input_variables)
+            variables = dict(self._input_variables)
             variables.update(self._output_variables)
 
             # ignore interrupt in subprocess
@@ -223,12 +399,13 @@ class PVAServer(multiprocessing.Process):
             # initialize global inputs
             self._structures = {}
             self._structure_specs = {}
+            self._structure_types = {}
             for variable_name, config in self._epics_config.items():
+                pvname = config.get("pvname")
 
                 if config["serve"]:
 
                     fields = config.get("fields")
-                    pvname = config.get("pvname")
 
                     if fields is not None:
 
@@ -239,54 +416,24 @@ class PVAServer(multiprocessing.Process):
                             # track fields in dict
                             self._field_to_parent_map[field] = variable_name
 
-                            variable = variables[field]
+                            variable = variables.get(field)
 
                             if variable is None:
                                 raise ValueError(
                                     f"Field {field} for {variable_name} not found in variable list"
                                 )
 
+                            nt, initial = self._build_nt(variable)
+
                             if variable.variable_type == "scalar":
                                 spec.append((field, "d"))
-                                nt = NTScalar("d")
-                                initial = variable.value
-
-                            if variable.variable_type == "table":
-                                spec.append((field, "v"))
-                                table_rep = ()
-                                for col in variable.columns:
-
-                                    # here we assume double type in tables...
-                                    table_rep += (col, "ad")
-
-                                nt = NTTable(table_rep)
-                                initial = nt.wrap(variable.value)
-
-                            if variable.variable_type == "array":
-                                spec.append((field, "v"))
-
-                                if variable.value_type == "str":
-                                    nt = NTScalar("s")
-                                    initial = variable.value
-
-                                else:
-                                    nd_array = variable.value.view(NTNDArrayData)
-                                    nt = NTNDArray()
-                                    initial = nt.wrap(nd_array)
 
-                            if variable.variable_type == "image":
+                            else:
                                 spec.append((field, "v"))
 
-                                nd_array = variable.value.view(NTNDArrayData)
-                                nd_array.attrib = {
-                                    "x_min": variable.x_min,
-                                    "y_min": variable.y_min,
-                                    "x_max": variable.x_max,
-                                    "y_max": variable.y_max,
-                                }
-
-                                nt = NTNDArray()
-                                initial = nt.wrap(nd_array)
+                                # variant fields hold the wrapped normative type
+                                if isinstance(initial, NTNDArrayData):
+                                    initial = nt.wrap(initial)
 
                             structure[field] = initial
 
@@ -294,54 +441,14 @@ class PVAServer(multiprocessing.Process):
                         self._structures[variable_name] = structure
                         self._structure_specs[variable_name] = spec
                         struct_type = Type(id=variable_name, spec=spec)
+                        self._structure_types[variable_name] = struct_type
                         struct_value = Value(struct_type, structure)
                         pv = SharedPV(initial=struct_value)
                         self._providers[pvname] = pv
 
                     else:
                         variable = variables[variable_name]
-                        # prepare scalar variable types
-                        if variable.variable_type == "scalar":
-                            nt = NTScalar("d")
-                            initial = variable.value
-
-                        # prepare image variable types
-                        elif variable.variable_type == "image":
-                            nd_array = variable.value.view(NTNDArrayData)
-                            nd_array.attrib = {
-                                "x_min": variable.x_min,
-                                "y_min": variable.y_min,
-                                "x_max": variable.x_max,
-                                "y_max": variable.y_max,
-                            }
-                            nt = NTNDArray()
-                            initial = nd_array
-
-                        elif variable.variable_type == "table":
-                            table_rep = ()
-                            for col in variable.columns:
-
-                                # here we assume double type in tables...
-                                table_rep += (col, "ad")
-
-                            nt = NTTable(table_rep)
-                            initial = nt.wrap(variable.value)
-
-                        elif variable.variable_type == "array":
-                            if variable.value_type == "str":
-                                nt = NTScalar("as")
-                                initial = variable.value
-
-                            else:
-                                nd_array = variable.value.view(NTNDArrayData)
-                                nt = NTNDArray()
-                                initial = nd_array
-
-                        else:
-                            raise ValueError(
-                                "Unsupported variable type provided: %s",
-                                variable.variable_type,
-                            )
+                        nt, initial = self._build_nt(variable)
 
                         if variable.name in self._input_variables:
                             handler = PVAccessInputHandler(
@@ -359,7 +466,7 @@ class PVAServer(multiprocessing.Process):
 
                 # if not serving pv, set up monitor
                 else:
-                    if variable.name in self._input_variables:
+                    if variable_name in self._input_variables:
                         self._monitors[pvname] = self._context.monitor(
                             pvname, partial(self._monitor_callback, pvname)
                         )
@@ -375,30 +482,30 @@ class PVAServer(multiprocessing.Process):
                 description = self._epics_config["summary"].get("description")
                 id = self._epics_config["summary"].get("id")
 
-                spec = [
-                    ("id", "s"),
-                    ("owner", "s"),
-                    ("date_published", "s"),
-                    ("description", "s"),
-                    ("input_variables", "as"),
-                    ("output_variables", "as"),
-                ]
+                # structure fields are served through their parent pv
+                input_pvnames = []
+                output_pvnames = []
+                for variable_name, config in self._epics_config.items():
+                    if variable_name == "summary":
+                        continue
+
+                    fields = config.get("fields", [variable_name])
+                    if any([field in self._input_variables for field in fields]):
+                        input_pvnames.append(config["pvname"])
+
+                    else:
+                        output_pvnames.append(config["pvname"])
+
                 values = {
                     "id": id,
                     "date_published": date_published,
                     "description": description,
                     "owner": owner,
-                    "input_variables": [
-                        self._epics_config[var]["pvname"]
-                        for var in self._input_variables
-                    ],
-                    "output_variables": [
-                        self._epics_config[var]["pvname"]
-                        for var in self._input_variables
-                    ],
+                    "input_variables": input_pvnames,
+                    "output_variables": output_pvnames,
                 }
 
-                pv_type = Type(id="summary", spec=spec)
+                pv_type = Type(id="summary", spec=SUMMARY_SPEC)
                 value = Value(pv_type, values)
                 pv = SharedPV(initial=value)
                 self._providers[pvname] = pv
@@ -424,92 +531,125 @@ class PVAServer(multiprocessing.Process):
         variables = input_variables
         variables.update(output_variables)
 
+        # structures are posted once after all of their fields are updated
+        updated_structures = {}
+
         for variable in variables.values():
             parent = self._field_to_parent_map.get(variable.name)
 
             if variable.name in self._input_variables and variable.is_constant:
                 logger.debug("Cannot update constant variable.")
+                continue
 
-            else:
-                if variable.variable_type == "image":
-                    logger.debug(
-                        "pvAccess image process variable %s updated.", variable.name
-                    )
-                    nd_array = variable.value.view(NTNDArrayData)
-
-                    # get dw and dh from model output
-                    nd_array.attrib = {
-                        "x_min": variable.x_min,
-                        "y_min": variable.y_min,
-                        "x_max": variable.x_max,
-                        "y_max": variable.y_max,
-                    }
-                    value = nd_array
-
-                elif variable.variable_type == "array":
-                    logger.debug(
-                        "pvAccess array process variable %s updated.", variable.name
-                    )
-                    if variable.value_type == "str":
-                        value = variable.value
+            value_fn = self._value_fns.get(variable.name)
+            if value_fn is None:
+                value_fn = self._get_value_fn(variable)
+                self._value_fns[variable.name] = value_fn
 
-                    else:
-                        value = variable.value.view(NTNDArrayData)
-
-                # do not build attribute pvs
-                else:
-                    logger.debug(
-                        "pvAccess process variable %s updated with value %s.",
-                        variable.name,
-                        variable.value,
-                    )
-                    value = variable.value
+            value = value_fn(variable)
+            logger.debug("pvAccess process variable %s updated.", variable.name)
 
             # update structure or pv
             if parent:
                 self._structures[parent][variable.name] = value
-                struct_type = Type(id=parent, spec=self._structure_specs[parent])
-                value = Value(struct_type, self._structures[parent])
-                pvname = self._varname_to_pvname_map[parent]
-                output_provider = self._providers[pvname]
+                updated_structures[parent] = self._varname_to_pvname_map[parent]
 
             else:
-                pvname = self._varname_to_pvname_map[variable.name]
-                output_provider = self._providers[pvname]
+                self._post_pv(self._varname_to_pvname_map[variable.name], value)
 
-            if output_provider:
-                output_provider.post(value)
+        for parent, pvname in updated_structures.items():
+            value = Value(self._structure_types[parent], self._structures[parent])
+            self._post_pv(pvname, value)
 
-            # in this case externally hosted
-            else:
-                try:
-                    self._context.put(pvname, value)
-                except:
-                    self.exit_event.set()
-                    self.shutdown()
+    def _get_value_fn(self, variable: Union[InputVariable, OutputVariable]):
+        """Select the function building the posted value for a variable, so the
+        variable type is only inspected once.
+
+        Args:
+            variable (Union[InputVariable, OutputVariable]): Variable to post
+
+        """
+        if variable.variable_type == "image":
+            return self._get_image_value
+
+        elif variable.variable_type == "array" and variable.value_type != "str":
+            return _get_array_value
+
+        # scalars, tables, and string arrays are posted directly
+        else:
+            return _get_raw_value
+
+    def _get_image_value(self, variable: OutputVariable) -> NTNDArrayData:
+        """Build the NTNDArray posted for an image variable.
+
+        Args:
+            variable (OutputVariable): Image variable
+
+        """
+        nd_array = variable.value.view(NTNDArrayData)
+
+        # get dw and dh from model output
+        nd_array.attrib = self._get_image_attrib(variable)
+        return nd_array
+
+    def _post_pv(self, pvname: str, value) -> None:
+        """Post a value to a served process variable or put to an externally hosted
+        process variable.
+
+        Args:
+            pvname (str): Name of process variable
+
+            value: Value to post
+
+        """
+        output_provider = self._providers[pvname]
+
+        if output_provider:
+            output_provider.post(value)
+
+        # in this case externally hosted
+        else:
+            try:
+                self._context.put(pvname, value)
+            except:
+                self.exit_event.set()
+                self.shutdown()
 
     def run(self) -> None:
         """Start server process."""
+        self._cached_values_lock = threading.Lock()
         self.setup_server()
 
+        self._coalesce_thread = threading.Thread(
+            target=self._coalesce_cached_values, daemon=True
+        )
+        self._coalesce_thread.start()
+
         # mark running
         while not self.shutdown_event.is_set():
             try:
-                data = self._out_queue.get_nowait()
-                inputs = data.get("input_variables", {})
-                outputs = data.get("output_variables", {})
-                self.update_pvs(inputs, outputs)
-
-                # check cached values
-                if len(self._cached_values) > 0 and not self._running_indicator.value:
-                    self._in_queue.put(
-                        {"protocol": self.protocol, "vars": self._cached_values}
-                    )
+                data = self._out_queue.get(timeout=0.1)
 
             except Empty:
-                time.sleep(0.1)
                 logger.debug("out queue empty")
+                continue
+
+            inputs = dict(data.get("input_variables", {}))
+            outputs = dict(data.get("output_variables", {}))
+
+            # merge any pending updates, keeping the latest value for each variable
+            for _ in range(self._max_batch_size - 1):
+                try:
+                    data = self._out_queue.get_nowait()
+                except Empty:
+                    break
+
+                inputs.update(data.get("input_variables", {}))
+                outputs.update(data.get("output_variables", {}))
 
+            self.update_pvs(inputs, outputs)
+
+        self._coalesce_thread.join()
         self._context.close()
         if self.pva_server is not None:
             self.pva_server.stop()
@@ -521,6 +661,16 @@ class PVAServer(multiprocessing.Process):
         self.shutdown_event.set()
 
 
+def _get_raw_value(variable: Union[InputVariable, OutputVariable]):
+    """Get a variable value to post without conversion."""
+    return variable.value
+
+
+def _get_array_value(variable: Union[InputVariable, OutputVariable]) -> NTNDArrayData:
+    """Get an NTNDArray view of a numeric array variable value to post."""
+    return variable.value.view(NTNDArrayData)
+
+
 class PVAccessInputHandler:
     """
     Handler object that defines the callbacks to execute on put operations to input
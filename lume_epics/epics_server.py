@@ -30,6 +30,48 @@ from .epics_ca_server import CAServer
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# maximum number of pending input updates from protocol servers
+IN_QUEUE_MAXSIZE = 256
+
+# maximum number of input updates merged into a single model evaluation
+MAX_INPUT_BATCH = 64
+
+# maximum number of pending updates for each protocol server
+OUT_QUEUE_MAXSIZE = 8
+
+
+def _put_latest(queue: multiprocessing.Queue, message: dict) -> None:
+    """Put an update on a protocol server queue without blocking. If the queue is
+    full, all pending updates are drained and merged in order beneath the new one,
+    so only values superseded by later updates are dropped.
+
+    Args:
+        queue (multiprocessing.Queue): Protocol server out queue
+
+        message (dict): Update mapping "input_variables" and/or "output_variables"
+            to variables
+
+    """
+    drained = []
+    update = message
+    while True:
+        try:
+            queue.put_nowait(update)
+            return
+
+        except Full:
+            while True:
+                try:
+                    drained.append(queue.get_nowait())
+                except Empty:
+                    break
+
+            # later updates win, with the new update applied last
+            update = {}
+            for pending in drained + [message]:
+                for key, variables in pending.items():
+                    update.setdefault(key, {}).update(variables)
+
 
 class Server:
     """
@@ -43,12 +85,20 @@ class Server:
 
         output_variables (Dict[str: OutputVariable]): Model output variables
 
+        _model_input_names (Set[str]): Names of the model's input variables
+
         epics_config (Optional[Dict]): ...
 
         _pva_fields (List[str]): List of variables pointing to pvAccess fields
 
         _protocols (List[str]): List of protocols in use
 
+        _protocol_variables (Dict[str, Set[str]]): Names of variables synced with each
+            protocol server
+
+        _protocol_outputs (Dict[str, Set[str]]): Names of output variables sent to each
+            protocol server, including pvAccess fields
+
         in_queue (multiprocessing.Queue):
 
         out_queues (Dict[str, multiprocessing.Queue]): Queue updates to output
@@ -56,7 +106,7 @@ class Server:
 
         exit_event (multiprocessing.Event): Event triggering shutdown
 
-        _running_indicator (multiprocessing.Value): Value indicating whether server is running
+        _running_indicator (multiprocessing.RawValue): Value indicating whether server is running
 
         _process_exit_events (List[multiprocessing.Event]): Exit events for each process
 
@@ -100,6 +150,7 @@ class Server:
         self.model = model_class(**model_kwargs)
         self.input_variables = self.model.input_variables
         self.output_variables = self.model.output_variables
+        self._model_input_names = set(self.input_variables)
 
         self._epics_config = epics_config
 
@@ -146,15 +197,26 @@ class Server:
         if len(pva_config) > 0:
             self._protocols.append("pva")
 
+        # variable names by protocol for fan out to servers
+        protocol_configs = {"ca": ca_config, "pva": pva_config}
+        self._protocol_variables = {
+            protocol: set(protocol_configs[protocol]) for protocol in self._protocols
+        }
+        self._protocol_outputs = {
+            protocol: self._protocol_variables[protocol].union(self._pva_fields)
+            for protocol in self._protocols
+        }
+
         # set up protocol based queues
-        self.in_queue = multiprocessing.Queue()
+        self.in_queue = multiprocessing.Queue(maxsize=IN_QUEUE_MAXSIZE)
         self.out_queues = dict()
         for protocol in self._protocols:
-            self.out_queues[protocol] = multiprocessing.Queue()
+            self.out_queues[protocol] = multiprocessing.Queue(maxsize=OUT_QUEUE_MAXSIZE)
 
         # exit event for triggering shutdown
         self.exit_event = multiprocessing.Event()
-        self._running_indicator = multiprocessing.Value("b", False)
+        # single byte flag with one writer, reads and writes need no lock
+        self._running_indicator = multiprocessing.RawValue("b", False)
         self._process_exit_events = []
 
         # event for shutdown on model execution exceptions
@@ -249,7 +311,11 @@ class Server:
 
         """
         model = self.model
-        inputs_initialized = 0
+
+        # inputs still awaiting a value before the model can be evaluated
+        uninitialized_inputs = {
+            name for name, var in self.input_variables.items() if var.value is None
+        }
 
         while not self.exit_event.is_set():
             try:
@@ -258,58 +324,73 @@ class Server:
                 # mark running
                 running_indicator.value = True
 
-                for var in data["vars"]:
-                    self.input_variables[var] = data["vars"][var]
+                # drain pending updates so bursts produce a single evaluation
+                messages = [data]
+                while len(messages) < MAX_INPUT_BATCH:
+                    try:
+                        messages.append(in_queue.get_nowait())
+                    except Empty:
+                        break
+
+                # merge updates, keeping the latest value and source of each variable
+                updates = {}
+                sources = {}
+                for message in messages:
+                    for var, variable in message["vars"].items():
+                        updates[var] = variable
+                        sources[var] = message["protocol"]
+
+                self.input_variables.update(updates)
 
                 # check no input values are None
-                if not any(
-                    [var.value is None for var in self.input_variables.values()]
-                ):
-                    inputs_initialized = 1
+                if uninitialized_inputs:
+                    uninitialized_inputs.difference_update(
+                        var
+                        for var, variable in updates.items()
+                        if variable.value is not None
+                    )
 
                 # update output variable state
-                if inputs_initialized:
+                if not uninitialized_inputs:
 
                     # sync pva/ca if duplicated
                     for protocol, queue in out_queues.items():
-                        if protocol != data["protocol"]:
-                            inputs = {
-                                var: self.input_variables[var]
-                                for var in data["vars"]
-                                if self._epics_config[var]["protocol"]
-                                in [protocol, "both"]
-                            }
-
-                            if len(inputs):
-                                queue.put({"input_variables": inputs})
-
-                    model_input = self.input_variables
-
-                    try:
-                        predicted_output = model.evaluate(model_input)
-
-                        for protocol, queue in out_queues.items():
-                            outputs = {
-                                var.name: var
-                                for var in predicted_output.values()
-                                if var.name in self._pva_fields
-                                or self._epics_config[var.name]["protocol"]
-                                in [protocol, "both"]
-                            }
-                            queue.put({"output_variables": outputs}, timeout=0.1)
-
-                    except Exception as e:
-                        traceback.print_exc()
-                        self._model_exec_exit_event.set()
+                        synced = self._protocol_variables[protocol] & updates.keys()
+                        inputs = {
+                            var: self.input_variables[var]
+                            for var in synced
+                            if sources[var] != protocol
+                        }
+
+                        if len(inputs):
+                            _put_latest(queue, {"input_variables": inputs})
+
+                    # skip evaluation if no model input was updated
+                    if self._model_input_names.isdisjoint(updates):
+                        logger.debug("No model inputs updated, skipping evaluation.")
+
+                    else:
+                        try:
+                            predicted_output = model.evaluate(self.input_variables)
+
+                            for protocol, queue in out_queues.items():
+                                protocol_outputs = self._protocol_outputs[protocol]
+                                outputs = {
+                                    var.name: var
+                                    for var in predicted_output.values()
+                                    if var.name in protocol_outputs
+                                }
+                                _put_latest(queue, {"output_variables": outputs})
+
+                        except Exception as e:
+                            traceback.print_exc()
+                            self._model_exec_exit_event.set()
 
                 running_indicator.value = False
 
             except Empty:
                 continue
 
-            except Full:
-                logger.error(f"{protocol} queue is full.")
-
         logger.info("Stopping execution thread")
 
     def start(self, monitor: bool = True) -> None:
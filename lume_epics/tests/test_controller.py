@@ -3,6 +3,8 @@ import time
 import numpy as np
 import epics
 
+from lume_epics.client.controller import DEFAULT_IMAGE_DATA
+
 
 @pytest.fixture(scope="module")
 def image_variables(model):
@@ -59,3 +61,50 @@ def test_controller_image_update(
             x_max=var.x_max,
             y_max=var.y_max,
         )
+
+
+def test_controller_image_monitor_toggle(
+    controller, image_variables, epics_config, server
+):
+    for var in image_variables:
+        pvname = epics_config[var.name]["pvname"]
+        protocol = epics_config[var.name]["protocol"]
+        controller.get_image(var.name)
+
+        # reads fall back to on-demand gets while unmonitored
+        controller.disable_monitor(var.name)
+
+        if protocol == "ca":
+            pv = controller._pvs[f"{pvname}:ArrayData_RBV"]
+            assert not pv.auto_monitor
+            assert not pv.callbacks
+
+        else:
+            assert controller._pvs[pvname] is None
+
+        image = controller.get_image(var.name)
+        assert image is not DEFAULT_IMAGE_DATA
+        assert_served_image(image, var)
+
+        controller.enable_monitor(var.name)
+
+        if protocol == "ca":
+            # the kept pv is resubscribed rather than recreated
+            assert controller._pvs[f"{pvname}:ArrayData_RBV"] is pv
+            assert pv.auto_monitor
+            assert pv.callbacks
+
+        else:
+            assert controller._pvs[pvname] is not None
+
+        image = controller.get_image(var.name)
+        assert image is not DEFAULT_IMAGE_DATA
+        assert_served_image(image, var)
+
+
+def assert_served_image(image, var):
+    assert np.allclose(image["image"][0].flatten(), var.default.flatten())
+    assert image["x"][0] == pytest.approx(var.x_min)
+    assert image["y"][0] == pytest.approx(var.y_min)
+    assert image["dw"][0] == pytest.approx(var.x_max - var.x_min)
+    assert image["dh"][0] == pytest.approx(var.y_max - var.y_min)
@@ -10,6 +10,8 @@ from lume_model.variables import (
 )
 import multiprocessing
 import numpy as np
+from p4p.client.thread import Context
+from lume_epics.tests.conftest import PVA_CONFIG
 
 
 def test_pva_server(epics_config):
@@ -134,3 +136,59 @@ def test_pva_server_struct(epics_config_struct):
 
     server.start()
     server.shutdown()
+
+
+def test_pva_server_summary():
+    epics_config = {
+        "input1": {"pvname": "test:summary:input1", "serve": True, "protocol": "pva"},
+        "output_struct": {
+            "pvname": "test:summary:output_struct",
+            "serve": True,
+            "protocol": "pva",
+            "fields": ["output1"],
+        },
+        "summary": {
+            "pvname": "test:summary",
+            "owner": "",
+            "date_published": "",
+            "description": "",
+            "id": "",
+        },
+    }
+
+    input_variables = {
+        "input1": ScalarInputVariable(name="input1", default=1.0, range=[0.0, 5.0]),
+    }
+    output_variables = {
+        "output1": ScalarOutputVariable(name="output1", value=1.0),
+    }
+
+    in_queue = multiprocessing.Queue()
+    out_queue = multiprocessing.Queue()
+    running_indicator = multiprocessing.Value("b", False)
+
+    server = PVAServer(
+        input_variables,
+        output_variables,
+        epics_config,
+        in_queue,
+        out_queue,
+        running_indicator,
+    )
+
+    # initial model outputs
+    out_queue.put({"output_variables": output_variables})
+    server.start()
+
+    ctxt = Context("pva", conf=PVA_CONFIG)
+    try:
+        summary = ctxt.get("test:summary", timeout=10)
+
+        # structure pvs are reported rather than their fields
+        assert list(summary["input_variables"]) == ["test:summary:input1"]
+        assert list(summary["output_variables"]) == ["test:summary:output_struct"]
+
+    finally:
+        ctxt.close()
+        server.shutdown()
+        server.join(timeout=5)
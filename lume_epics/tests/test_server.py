@@ -1,3 +1,4 @@
+import multiprocessing
 import numpy as np
 import time
 import pytest
@@ -6,6 +7,7 @@ import os
 import sys
 import epics
 import signal
+from queue import Empty
 from epicscorelibs.path import get_lib
 from p4p.client.thread import Context
 from p4p import cleanup
@@ -121,3 +123,20 @@ def test_constant_variable_pva(value, server, model, epics_config):
                 assert val == value
 
     ctxt.close()
+
+
+def test_put_latest_full_queue():
+    queue = multiprocessing.Queue(maxsize=3)
+    for tick in range(3):
+        queue.put({"output_variables": {"out": tick}})
+
+    epics_server._put_latest(queue, {"input_variables": {"in": "new"}})
+
+    # pending updates are merged in order under the new update
+    assert queue.get(timeout=1) == {
+        "output_variables": {"out": 2},
+        "input_variables": {"in": "new"},
+    }
+
+    with pytest.raises(Empty):
+        queue.get(timeout=0.1)